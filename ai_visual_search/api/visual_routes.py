@@ -6,6 +6,7 @@ Two endpoints only: detect + embed
 from fastapi import APIRouter, UploadFile, File, Query, HTTPException
 from typing import Optional
 import logging
+import math
 import sys
 import os
 
@@ -71,7 +72,8 @@ async def detect_objects(
 @router.post("/embed")
 async def embed_image(
     file: UploadFile = File(...),
-    bbox: Optional[str] = Query(None, description="Bounding box as 'x1,y1,x2,y2' to crop before embedding")
+    bbox: Optional[str] = Query(None, description="Bounding box as 'x1,y1,x2,y2' to crop before embedding"),
+    bboxes: Optional[str] = Query(None, description="Several boxes as 'x1,y1,x2,y2;x1,y1,x2,y2', embedded in one batch")
 ):
     """
     Generate CLIP embedding for uploaded image (or cropped region)
@@ -79,6 +81,8 @@ async def embed_image(
     Args:
         file: Image file
         bbox: Optional bounding box to crop (format: "x1,y1,x2,y2")
+        bboxes: Optional list of boxes to crop and embed together
+                (format: "x1,y1,x2,y2;x1,y1,x2,y2"), takes precedence over bbox
     
     Returns:
         {
@@ -87,20 +91,53 @@ async def embed_image(
             "cropped": true/false,
             "bbox": [x1, y1, x2, y2] (if cropped)
         }
+        or, with bboxes:
+        {
+            "embeddings": [[768-dim array], ...],
+            "dimension": 768,
+            "bboxes": [[x1, y1, x2, y2], ...]
+        }
     """
     try:
         # Read image bytes
         image_bytes = await file.read()
-        image = bytes_to_pil(image_bytes)
         
-        # Crop if bbox provided
+        # Batch crop + embed all boxes in one forward pass
+        if bboxes:
+            try:
+                crop_bboxes = [list(map(float, b.split(','))) for b in bboxes.split(';') if b.strip()]
+                if not crop_bboxes or any(len(b) != 4 for b in crop_bboxes):
+                    raise ValueError("expected 'x1,y1,x2,y2' per box")
+                if not all(math.isfinite(v) for b in crop_bboxes for v in b):
+                    raise ValueError("coordinates must be finite numbers")
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid bboxes '{bboxes}': {e}")
+            
+            image = bytes_to_pil(image_bytes)
+            
+            # Out-of-image, empty or too-small boxes are rejected by preprocessing
+            try:
+                with timer(f"CLIP Batch Embedding ({len(crop_bboxes)} crops)"):
+                    embeddings = embedder.get_embeddings(image, crop_bboxes)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid bboxes '{bboxes}': {e}")
+            
+            return {
+                "embeddings": embeddings.tolist(),
+                "dimension": embeddings.shape[1],
+                "bboxes": crop_bboxes
+            }
+        
+        # Crop if bbox provided; otherwise hand the raw bytes to the embedder
+        # so large JPEGs are draft-decoded (no coordinates to preserve)
+        image = image_bytes
         cropped = False
         crop_bbox = None
         if bbox:
             try:
                 x1, y1, x2, y2 = map(float, bbox.split(','))
                 crop_bbox = [x1, y1, x2, y2]
-                image = crop_image(image, crop_bbox)
+                image = crop_image(bytes_to_pil(image_bytes), crop_bbox)
                 cropped = True
                 logger.info(f"Cropped image with bbox: {crop_bbox}")
             except Exception as e:
@@ -117,6 +154,8 @@ async def embed_image(
             "bbox": crop_bbox if cropped else None
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Embedding failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Embedding failed: {str(e)}")
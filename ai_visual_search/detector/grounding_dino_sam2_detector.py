@@ -23,6 +23,12 @@ DINO_CHECKPOINT = os.path.join(MODEL_DIR, "groundingdino_swint_ogc.pth")
 SAM2_CONFIG = os.path.join(MODEL_DIR, "sam2_hiera_base.yaml")
 SAM2_CHECKPOINT = os.path.join(MODEL_DIR, "sam2_hiera_large.pt")
 
+# JPEG draft target: libjpeg picks the largest 1/2, 1/4 or 1/8 scale that
+# keeps both sides >= this, so a drafted upload's shorter side ends up
+# between 1333 and ~2666 px (the longer side follows the aspect ratio).
+# predict() does not resize, so this is also GroundingDINO's input size.
+MAX_DECODE_SIZE = 1333
+
 # Global singleton cache
 _dino_model = None
 _sam2_predictor = None
@@ -128,8 +134,13 @@ class GroundingDINOSAM2Detector:
         # Load models if needed
         self._load_models()
         
-        # Parse image
-        image = Image.open(BytesIO(image_bytes)).convert("RGB")
+        # Parse image (large JPEGs are decoded and detected at reduced scale;
+        # boxes are normalized, so they are mapped back to the original size)
+        image = Image.open(BytesIO(image_bytes))
+        w, h = image.size
+        if image.format == "JPEG":
+            image.draft("RGB", (MAX_DECODE_SIZE, MAX_DECODE_SIZE))
+        image = image.convert("RGB")
         image_np = np.array(image)
         
         # Use custom settings or defaults
@@ -156,7 +167,6 @@ class GroundingDINOSAM2Detector:
             )
             
             # Convert boxes from normalized [0,1] to pixel coordinates
-            h, w = image_np.shape[:2]
             boxes_np = boxes.cpu().numpy()
             boxes_scaled = boxes_np * np.array([w, h, w, h])
             
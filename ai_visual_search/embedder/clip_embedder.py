@@ -5,12 +5,13 @@ ViT-L/14 model with laion2b weights (768-dim embeddings)
 
 import torch
 import open_clip
+from torchvision.transforms import Normalize
 from PIL import Image
 import numpy as np
 from typing import Union, List
 import logging
 
-from .preprocess import preprocess_for_clip
+from .preprocess import preprocess_for_clip, crop_and_preprocess_batch, MAX_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,8 @@ EMBEDDING_DIM = 768
 _clip_model = None
 _clip_preprocess = None
 _clip_tokenizer = None
+_clip_mean = None
+_clip_std = None
 _model_lock = False
 
 
@@ -46,7 +49,7 @@ class CLIPEmbedder:
     
     def _load_model(self):
         """Lazy load CLIP model on first embedding generation"""
-        global _clip_model, _clip_preprocess, _clip_tokenizer, _model_lock
+        global _clip_model, _clip_preprocess, _clip_tokenizer, _clip_mean, _clip_std, _model_lock
         
         if _clip_model is not None:
             return
@@ -75,11 +78,19 @@ class CLIPEmbedder:
                 for param in model.parameters():
                     param.requires_grad = False
                 
+                # NHWC lets oneDNN run the patch-embed conv without permutes
+                model = model.to(memory_format=torch.channels_last)
+                
                 tokenizer = open_clip.get_tokenizer(CLIP_MODEL)
                 
-                _clip_model = model
+                # Batch path normalizes with the same mean/std as the transform
+                normalize = next(t for t in preprocess.transforms if isinstance(t, Normalize))
+                
+                _clip_mean = torch.tensor(normalize.mean).view(1, 3, 1, 1)
+                _clip_std = torch.tensor(normalize.std).view(1, 3, 1, 1)
                 _clip_preprocess = preprocess
                 _clip_tokenizer = tokenizer
+                _clip_model = model
                 
                 logger.info(f"✅ CLIP model loaded successfully ({EMBEDDING_DIM}-dim embeddings)")
         
@@ -88,6 +99,8 @@ class CLIPEmbedder:
             _clip_model = None
             _clip_preprocess = None
             _clip_tokenizer = None
+            _clip_mean = None
+            _clip_std = None
             raise RuntimeError(f"CLIP model loading failed: {str(e)}")
         
         finally:
@@ -109,13 +122,17 @@ class CLIPEmbedder:
         # Parse image if bytes
         if isinstance(image, bytes):
             from io import BytesIO
-            image = Image.open(BytesIO(image)).convert("RGB")
+            image = Image.open(BytesIO(image))
+            if image.format == "JPEG":
+                image.draft("RGB", (MAX_SIZE, MAX_SIZE))
+            image = image.convert("RGB")
         
         # Preprocess image (224x224, square pad)
         processed_image, metadata = preprocess_for_clip(image)
         
         # Apply CLIP preprocessing (normalization, tensor conversion)
         image_tensor = _clip_preprocess(processed_image).unsqueeze(0)
+        image_tensor = image_tensor.contiguous(memory_format=torch.channels_last)
         
         # Generate embedding
         with torch.no_grad():
@@ -131,6 +148,48 @@ class CLIPEmbedder:
         
         return embedding_np
     
+    def get_embeddings(self, image: Image.Image, bboxes: List[list]) -> np.ndarray:
+        """
+        Generate CLIP embeddings for several regions of one image
+        
+        All crops are preprocessed into one batch and encoded in a single
+        forward pass.
+        
+        Args:
+            image: PIL Image
+            bboxes: list of [x1, y1, x2, y2] in pixel coordinates
+        
+        Returns:
+            numpy array of shape (N, 768) with L2-normalized embeddings
+        """
+        if not bboxes:
+            return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        
+        # Crop + preprocess all regions (N, 224, 224, 3) uint8
+        batch = crop_and_preprocess_batch(image, bboxes)
+        
+        # Load model if needed
+        self._load_model()
+        
+        # Same normalization as CLIP preprocessing, applied to the whole batch
+        image_tensor = torch.from_numpy(batch).permute(0, 3, 1, 2).float().div_(255)
+        image_tensor = image_tensor.sub_(_clip_mean).div_(_clip_std)
+        image_tensor = image_tensor.contiguous(memory_format=torch.channels_last)
+        
+        # Generate embeddings
+        with torch.no_grad():
+            embeddings = _clip_model.encode_image(image_tensor)
+            
+            # L2 normalize
+            embeddings = embeddings / embeddings.norm(dim=-1, keepdim=True)
+            
+            # Convert to numpy
+            embeddings_np = embeddings.cpu().numpy()
+        
+        logger.debug(f"Generated batch embeddings: shape={embeddings_np.shape}")
+        
+        return embeddings_np
+    
     def get_text_embedding(self, text: str) -> np.ndarray:
         """
         Generate CLIP embedding for text
@@ -5,7 +5,7 @@ Image preprocessing for CLIP embeddings
 
 import numpy as np
 from PIL import Image, ImageOps
-from typing import Tuple
+from typing import Tuple, List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,9 +21,9 @@ def preprocess_for_clip(image: Image.Image) -> Tuple[Image.Image, dict]:
     
     Steps:
     1. Quality check (size validation)
-    2. Square pad to maintain aspect ratio
-    3. Resize to 224x224
-    4. Convert to RGB
+    2. Convert to RGB
+    3. Resize longer side to 224 (maintain aspect ratio)
+    4. Square pad onto a 224x224 white canvas
     
     Args:
         image: PIL Image
@@ -42,29 +42,25 @@ def preprocess_for_clip(image: Image.Image) -> Tuple[Image.Image, dict]:
         raise ValueError(f"Image too small: {w}x{h}. Minimum is {MIN_SIZE}x{MIN_SIZE}")
     
     if w > MAX_SIZE or h > MAX_SIZE:
-        logger.warning(f"Image very large: {w}x{h}. Resizing before processing")
-        image.thumbnail((MAX_SIZE, MAX_SIZE), Image.Resampling.LANCZOS)
-        w, h = image.size
+        logger.warning(f"Image very large: {w}x{h}. Downscaling directly to {TARGET_SIZE}")
     
     # 2. Convert to RGB
     if image.mode != "RGB":
         image = image.convert("RGB")
     
-    # 3. Square pad (maintain aspect ratio)
+    # 3 + 4. Resize then pad, so no max_dim x max_dim intermediate is allocated
     max_dim = max(w, h)
-    padded = Image.new("RGB", (max_dim, max_dim), (255, 255, 255))
-    offset = ((max_dim - w) // 2, (max_dim - h) // 2)
-    padded.paste(image, offset)
-    
     metadata["padded_size"] = (max_dim, max_dim)
-    metadata["padding_offset"] = offset
+    metadata["padding_offset"] = ((max_dim - w) // 2, (max_dim - h) // 2)
+    
+    canvas = np.empty((TARGET_SIZE[1], TARGET_SIZE[0], 3), dtype=np.uint8)
+    _pad_and_resize_into(image, canvas)
     
-    # 4. Resize to 224x224
-    resized = padded.resize(TARGET_SIZE, Image.Resampling.LANCZOS)
+    resized = Image.fromarray(canvas)
     
     metadata["final_size"] = TARGET_SIZE
     
-    logger.debug(f"Preprocessed: {image.size} → {TARGET_SIZE}")
+    logger.debug(f"Preprocessed: {(w, h)} → {TARGET_SIZE}")
     
     return resized, metadata
 
@@ -95,3 +91,63 @@ def crop_image(image: Image.Image, bbox: list) -> Image.Image:
     cropped = image.crop((x1, y1, x2, y2))
     
     return cropped
+
+
+def _pad_and_resize_into(region: Image.Image, out: np.ndarray) -> None:
+    """Resize region to fit out (keeping aspect ratio) and center it on white"""
+    w, h = region.size
+    out_h, out_w = out.shape[:2]
+    
+    scale = min(out_w / w, out_h / h)
+    new_w = min(out_w, max(1, round(w * scale)))
+    new_h = min(out_h, max(1, round(h * scale)))
+    
+    # reducing_gap lets Pillow box-reduce large sources before LANCZOS
+    resized = region.resize((new_w, new_h), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    
+    top = (out_h - new_h) // 2
+    left = (out_w - new_w) // 2
+    out.fill(255)
+    out[top:top + new_h, left:left + new_w] = np.asarray(resized)
+
+
+def crop_and_preprocess_batch(image: Image.Image, bboxes: List[list]) -> np.ndarray:
+    """
+    Crop and preprocess several regions of one image for CLIP
+    
+    Each bbox is cropped, square padded and resized straight into a
+    preallocated batch buffer that can be encoded in one forward pass.
+    
+    Args:
+        image: PIL Image
+        bboxes: list of [x1, y1, x2, y2] in pixel coordinates
+    
+    Returns:
+        uint8 array of shape (N, 224, 224, 3)
+    """
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    w, h = image.size
+    
+    batch = np.empty((len(bboxes), TARGET_SIZE[1], TARGET_SIZE[0], 3), dtype=np.uint8)
+    
+    for i, bbox in enumerate(bboxes):
+        x1, y1, x2, y2 = (int(round(v)) for v in bbox)
+        
+        # Ensure valid bbox
+        x1 = max(0, min(x1, w))
+        y1 = max(0, min(y1, h))
+        x2 = max(0, min(x2, w))
+        y2 = max(0, min(y2, h))
+        
+        if x2 <= x1 or y2 <= y1:
+            raise ValueError(f"Invalid bbox: {bbox}")
+        
+        if x2 - x1 < MIN_SIZE or y2 - y1 < MIN_SIZE:
+            raise ValueError(f"Crop too small: {x2 - x1}x{y2 - y1}. Minimum is {MIN_SIZE}x{MIN_SIZE}")
+        
+        _pad_and_resize_into(image.crop((x1, y1, x2, y2)), batch[i])
+    
+    logger.debug(f"Preprocessed batch: {len(bboxes)} crops → {batch.shape}")
+    
+    return batch
@@ -10,21 +10,22 @@ logger = logging.getLogger(__name__)
 
 def bytes_to_pil(image_bytes: bytes) -> Image.Image:
     """Convert bytes to PIL Image"""
-    return Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    with io.BytesIO(image_bytes) as buffer, Image.open(buffer) as image:
+        return image.convert("RGB")
 
 
 def pil_to_bytes(image: Image.Image, format: str = "PNG") -> bytes:
     """Convert PIL Image to bytes"""
-    buffer = io.BytesIO()
-    image.save(buffer, format=format)
-    return buffer.getvalue()
+    with io.BytesIO() as buffer:
+        image.save(buffer, format=format)
+        return buffer.getvalue()
 
 
 def validate_image(image_bytes: bytes) -> bool:
     """Validate if bytes represent a valid image"""
     try:
-        img = Image.open(io.BytesIO(image_bytes))
-        img.verify()
+        with io.BytesIO(image_bytes) as buffer, Image.open(buffer) as img:
+            img.verify()
         return True
     except Exception as e:
         logger.warning(f"Invalid image: {e}")
@@ -1,6 +1,6 @@
 """
 Complete Pipeline Test
-Test: Detect → Crop → Preprocess → CLIP Embed
+Test: Detect → Crop → Preprocess → CLIP Embed (single + batch)
 """
 
 import torch
@@ -19,6 +19,7 @@ from detector import GroundingDINOSAM2Detector
 from embedder import CLIPEmbedder, crop_image, preprocess_for_clip
 from utils import bytes_to_pil, setup_logger
 from PIL import Image
+import numpy as np
 import io
 
 logger = setup_logger("test")
@@ -119,6 +120,33 @@ def test_complete_pipeline(image_path: str = None):
         logger.error(f"❌ Embedding failed: {e}")
         return False
     
+    # Step 6: Batch embeddings must match the single-box path
+    logger.info("\n📦 STEP 5: Batch embedding vs single-box embedding")
+    logger.info("-" * 60)
+    
+    try:
+        image = bytes_to_pil(image_bytes)
+        w, h = image.size
+        bboxes = [
+            det['bbox'] for det in result['detections'][:3]
+            if det['bbox'][2] - det['bbox'][0] >= 50 and det['bbox'][3] - det['bbox'][1] >= 50
+        ] or [[0, 0, w, h], [0, 0, w // 2, h // 2]]
+        
+        batch_embeddings = embedder.get_embeddings(image, bboxes)
+        
+        for bbox, batch_embedding in zip(bboxes, batch_embeddings):
+            single_embedding = embedder.get_embedding(crop_image(image, bbox))
+            max_diff = float(np.abs(batch_embedding - single_embedding).max())
+            if max_diff > 1e-4:
+                logger.error(f"❌ Batch embedding differs for bbox={bbox}: max diff {max_diff:.6f}")
+                return False
+        
+        logger.info(f"✅ Batch embeddings match single-box path for {len(bboxes)} boxes")
+    
+    except Exception as e:
+        logger.error(f"❌ Batch embedding failed: {e}")
+        return False
+    
     # Success
     logger.info("\n" + "=" * 60)
     logger.info("✅ PIPELINE TEST COMPLETE - ALL STEPS PASSED")